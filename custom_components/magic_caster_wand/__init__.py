@@ -18,7 +18,7 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, CONF_TFLITE_URL, DEFAULT_TFLITE_URL
-from .mcw_ble import BLEData, McwDevice, LedGroup, SpellMacros
+from .mcw_ble import BLEData, McwDevice, LedGroup, get_spell_macro
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.TEXT, Platform.SELECT, Platform.BINARY_SENSOR, Platform.BUTTON, Platform.CAMERA]
 
@@ -168,7 +168,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             if entry_id and entry_id in hass.data[DOMAIN]:
                 device: McwDevice = hass.data[DOMAIN][entry_id]["mcw"]
                 # Use helper for more robust spell matching
-                from .mcw_ble import get_spell_macro
                 macro = get_spell_macro(spell_name)
                 if macro:
                     await device.send_macro(macro)
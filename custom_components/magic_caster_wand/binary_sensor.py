@@ -16,7 +16,6 @@ from homeassistant.helpers.update_coordinator import (
 )
 
 from .const import DOMAIN, MANUFACTURER
-from .mcw_ble import BLEData
 
 _LOGGER = logging.getLogger(__name__)
 
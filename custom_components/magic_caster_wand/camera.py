@@ -8,13 +8,12 @@ from collections import deque
 
 from PIL import Image, ImageDraw
 
-from homeassistant.components.camera import Camera, CameraEntityFeature
+from homeassistant.components.camera import Camera
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import DOMAIN, MANUFACTURER
 from .mcw_ble.spell_tracker import SpellTracker
@@ -77,7 +76,8 @@ class McwSpellCamera(CoordinatorEntity, Camera):
         self._last_point = None
         self._last_image = None
         self._prev_button_all = False
-        self._frame_cond = asyncio.Condition()
+        # Set and replaced each time a frame is drawn; MJPEG streams wait on the current one
+        self._frame_event = asyncio.Event()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -273,11 +273,9 @@ class McwSpellCamera(CoordinatorEntity, Camera):
         self._last_image = self._image_to_bytes(img)
         self.async_write_ha_state()
 
-        async def _notify():
-            async with self._frame_cond:
-                self._frame_cond.notify_all()
-        
-        self._hass.async_create_task(_notify())
+        # Wake waiting streams directly rather than spawning a task per frame to notify a Condition
+        frame_event, self._frame_event = self._frame_event, asyncio.Event()
+        frame_event.set()
 
     async def handle_async_mjpeg_stream(self, request):
         """Generate an HTTP MJPEG stream from the camera."""
@@ -289,9 +287,8 @@ class McwSpellCamera(CoordinatorEntity, Camera):
 
         try:
             while True:
-                async with self._frame_cond:
-                    await self._frame_cond.wait()
-                    img_bytes = self._last_image
+                await self._frame_event.wait()
+                img_bytes = self._last_image
 
                 await response.write(
                     f"--frame\r\n"
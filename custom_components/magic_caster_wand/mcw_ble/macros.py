@@ -33,6 +33,15 @@ class MACROIDS:
     SET_LOOP = 0x81
     """MacroSetLoopMessage.kt"""
 
+# Macro durations are big-endian uint16 milliseconds
+_U16_BE = struct.Struct('>H')
+
+# Encodings of the parameterless macro commands, built once at import
+_CLEAR_LEDS_BYTES = bytes([MACROIDS.LIGHT_CONTROL_CLEAR_ALL])
+_LOOP_BYTES = bytes([MACROIDS.SET_LOOP])
+_WAIT_BUSY_BYTES = bytes([MACROIDS.WAIT_BUSY])
+_CONTROL_BYTES = bytes([MACROIDS.CONTROL])
+
 @dataclass
 class ChangeLedCommand:
     """Change LED color on a specific group."""
@@ -49,13 +58,13 @@ class ChangeLedCommand:
             self.red & 0xFF,
             self.green & 0xFF,
             self.blue & 0xFF,
-        ]) + struct.pack('>H', self.duration_ms)
+        ]) + _U16_BE.pack(self.duration_ms)
 
 @dataclass
 class ClearLedsCommand:
     """Clear all LEDs."""
     def to_bytes(self) -> bytes:
-        return bytes([MACROIDS.LIGHT_CONTROL_CLEAR_ALL])
+        return _CLEAR_LEDS_BYTES
 
 @dataclass
 class DelayCommand:
@@ -63,7 +72,7 @@ class DelayCommand:
     duration_ms: int
     
     def to_bytes(self) -> bytes:
-        return bytes([MACROIDS.DELAY]) + struct.pack('>H', self.duration_ms)
+        return bytes([MACROIDS.DELAY]) + _U16_BE.pack(self.duration_ms)
 
 @dataclass
 class BuzzCommand:
@@ -71,13 +80,13 @@ class BuzzCommand:
     duration_ms: int
     
     def to_bytes(self) -> bytes:
-        return bytes([MACROIDS.HAP_BUZZ]) + struct.pack('>H', self.duration_ms)
+        return bytes([MACROIDS.HAP_BUZZ]) + _U16_BE.pack(self.duration_ms)
 
 @dataclass
 class LoopCommand:
     """Mark the start of a loop."""
     def to_bytes(self) -> bytes:
-        return bytes([MACROIDS.SET_LOOP])
+        return _LOOP_BYTES
 
 @dataclass
 class SetLoopsCommand:
@@ -91,7 +100,7 @@ class SetLoopsCommand:
 class WaitBusyCommand:
     """Wait for previous commands to complete."""
     def to_bytes(self) -> bytes:
-        return bytes([MACROIDS.WAIT_BUSY])
+        return _WAIT_BUSY_BYTES
 
 MacroCommandType = Union[
     ChangeLedCommand, ClearLedsCommand, DelayCommand,
@@ -142,7 +151,7 @@ class Macro:
         data = bytearray()
         for cmd in self.commands:
             data.extend(cmd.to_bytes())
-        return bytes([MACROIDS.CONTROL]) + bytes(data)
+        return _CONTROL_BYTES + bytes(data)
 
 class SpellMacros:
     """Pre-built macro templates for all spells."""
@@ -965,9 +974,10 @@ SPELL_MACRO_MAP = {
     'spell_fail': SpellMacros.spell_fail,
 }
 
+# Spell names arrive as "Wingardium Leviosa" or "The_Pepper-Breath_Hex"; map separators to '_'
+_NAME_TRANS = str.maketrans({' ': '_', '-': '_'})
+
 def get_spell_macro(spell_name: str) -> Optional[Macro]:
     """Get a macro for a spell by name."""
-    name = spell_name.lower().replace(' ', '_').replace('-', '_')
-    if name in SPELL_MACRO_MAP:
-        return SPELL_MACRO_MAP[name]()
-    return None
+    factory = SPELL_MACRO_MAP.get(spell_name.translate(_NAME_TRANS).lower())
+    return factory() if factory is not None else None
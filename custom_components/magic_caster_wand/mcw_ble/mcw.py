@@ -6,10 +6,12 @@ from __future__ import annotations
 import logging
 import struct
 import asyncio
-from asyncio import Event, sleep, wait_for
+import numpy as np
+from asyncio import Future, sleep, wait_for
 from bleak import BleakClient, BleakError
-from .macros import LedGroup, Macro
-from typing import Any, Callable, TypeVar
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from .macros import MACROIDS, LedGroup, Macro
+from typing import Any, Callable, TypedDict, TypeVar
 
 SERVICE_UUID = "57420001-587e-48a0-974c-544d6163c577"
 COMMAND_UUID = "57420002-587e-48a0-974c-544d6163c577"
@@ -81,6 +83,51 @@ MESSAGE_TO_RESPONSE_MAP: dict[int, int] = {
     MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ: RESPONSEIDS.WAND_PRODUCT_INFORMATION,
 }
 
+# Notifications buffered between bleak's receive callback and the consumer task
+_RX_QUEUE_SIZE = 64
+
+# Attempts per write_command before the error is propagated
+_WRITE_MAX_RETRIES = 3
+
+# Static outbound packets, built once at import
+_PKT_IMU_STREAM_START = bytes((MESSAGEIDS.IMUFLAG_SET, 0x00, 0x80))
+_PKT_IMU_STREAM_STOP = bytes((MESSAGEIDS.IMUFLAG_RESET,))
+_PKT_INIT_WAND = tuple(
+    bytes((MESSAGEIDS.BUTTON_SET_THRESHOLD, button, 0x05 if button < 4 else 0x08))
+    for button in range(8)
+)
+_PKT_CHALLENGE = bytes((MESSAGEIDS.CHALLENGE,))
+_PKT_FACTORY_UNLOCK = bytes((MESSAGEIDS.FACTORY_UNLOCK, 0x55, 0xAA))
+_PKT_BUTTON_CALIBRATION = bytes((MESSAGEIDS.BUTTON_CALIBRATION_BASELINE,))
+_PKT_IMU_CALIBRATION = bytes((MESSAGEIDS.IMU_CALIBRATION,))
+_PKT_BOX_ADDRESS_READ = bytes((MESSAGEIDS.BOX_ADDRESS_READ,))
+_PKT_FIRMWARE_VERSION_READ = bytes((MESSAGEIDS.FIRMWARE_VERSION_READ,))
+_PKT_WAND_SERIAL_NUMBER_READ = bytes((MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ, 0x01))
+_PKT_WAND_SKU_READ = bytes((MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ, 0x02))
+_PKT_WAND_DEVICE_ID_READ = bytes((MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ, 0x04))
+_PKT_LED_CLEAR_ALL = bytes((MESSAGEIDS.LIGHT_CONTROL_CLEAR_ALL,))
+_LED_PACK = struct.Struct("BBBBB").pack
+_LED_GROUP_REMAP = (0, 3, 2, 1)
+"""LedGroup (macro numbering) -> LIGHT_CONTROL_SET_LED group; POMMEL and MID_UPPER are swapped"""
+
+# Single-step macros, packed directly instead of through a Macro object
+_MACRO_SET_LED_PACK = struct.Struct(">BBBBBBH").pack
+_MACRO_BUZZ_PACK = struct.Struct(">BBH").pack
+_PKT_MACRO_CLEAR_LEDS = Macro().add_clear().to_bytes()
+
+# Spell names arrive NUL-padded with underscores for spaces
+_SPELL_NAME_TABLE = bytes.maketrans(b"_", b" ")
+
+# Calibration results reported to the calibration callback; shared, so never mutated
+_CALIBRATION_BUTTON_DONE = {"calibration_button": "Done"}
+_CALIBRATION_IMU_DONE = {"calibration_imu": "Done"}
+
+# Known responses that carry nothing we parse; not worth an "Unknown opcode" log
+_QUIET_RESPONSES = frozenset({
+    RESPONSEIDS.PONG,
+    RESPONSEIDS.BUTTON_READ_THRESHOLD,
+})
+
 _LOGGER = logging.getLogger(__name__)
 
 class BleakCharacteristicMissing(BleakError):
@@ -89,40 +136,64 @@ class BleakCharacteristicMissing(BleakError):
 class BleakServiceMissing(BleakError):
     """Raised when a service is missing."""
 
-class IMUSample:
-    """Represents a single IMU sensor sample with gyroscope and accelerometer data"""
-
-    # Sensor scale factors (from Android IMUSample.java)
-    _ACCELEROMETER_SCALE = 0.00048828125
-    _GYROSCOPE_SCALE = 0.0010908308
-
-    def __init__(self, gyro_x: int, gyro_y: int, gyro_z: int, accel_x: int, accel_y: int, accel_z: int):
-        self.gyro_x = gyro_x
-        self.gyro_y = gyro_y
-        self.gyro_z = gyro_z
-        self.accel_x = accel_x
-        self.accel_y = accel_y
-        self.accel_z = accel_z
-
-    def get_scaled_accel(self) -> tuple[float, float, float]:
-        """Returns accelerometer data scaled to G-forces"""
-        return (
-            self.accel_x * IMUSample._ACCELEROMETER_SCALE,
-            self.accel_y * IMUSample._ACCELEROMETER_SCALE,
-            self.accel_z * IMUSample._ACCELEROMETER_SCALE
-        )
-
-    def get_scaled_gyro(self) -> tuple[float, float, float]:
-        """Returns gyroscope data scaled to rad/s"""
-        return (
-            self.gyro_x * IMUSample._GYROSCOPE_SCALE,
-            self.gyro_y * IMUSample._GYROSCOPE_SCALE,
-            self.gyro_z * IMUSample._GYROSCOPE_SCALE
-        )
-
-    def __repr__(self):
-        return (f"IMUSample(gyro=({self.gyro_x}, {self.gyro_y}, {self.gyro_z}), "
-                f"accel=({self.accel_x}, {self.accel_y}, {self.accel_z}))")
+# IMU sensor scale factors (from Android IMUSample.java)
+_ACCELEROMETER_SCALE = 0.00048828125
+"""Raw accelerometer units to G-forces"""
+_GYROSCOPE_SCALE = 0.0010908308
+"""Raw gyroscope units to rad/s"""
+
+# Device ID type suffix -> wand type (from WandType.kt)
+_WAND_TYPE_MAP: dict[str, str] = {
+    "DF": "DEFIANT",
+    "LY": "LOYAL",
+    "HR": "HEROIC",
+    "HN": "HONOURABLE",
+    "AV": "ADVENTUROUS",
+    "WS": "WISE",
+}
+
+# One IMU sample on the wire: 6 little-endian int16s, decoded as a (6,) row
+_IMU_SAMPLE_DTYPE = np.dtype(("<i2", (6,)))
+
+# Per-column scale factors for a decoded IMU sample row
+_IMU_SCALE = np.array(
+    (_GYROSCOPE_SCALE,) * 3 + (_ACCELEROMETER_SCALE,) * 3,
+    dtype=np.float64,
+)
+
+class ButtonStates(TypedDict):
+    """Button states passed to the buttons callback."""
+    button_1: bool
+    button_2: bool
+    button_3: bool
+    button_4: bool
+    button_all: bool
+
+# Button states for every 4-bit mask; shared between notifications, so callbacks must not mutate them
+_BUTTON_STATES: tuple[ButtonStates, ...] = tuple(
+    ButtonStates(
+        button_1=bool(mask & 0x01),
+        button_2=bool(mask & 0x02),
+        button_3=bool(mask & 0x04),
+        button_4=bool(mask & 0x08),
+        button_all=mask == 0x0F,
+    )
+    for mask in range(16)
+)
+
+class IMUReading(TypedDict):
+    """Scaled IMU sample passed to the IMU callback (rad/s and G-forces)."""
+    gyro_x: float
+    gyro_y: float
+    gyro_z: float
+    accel_x: float
+    accel_y: float
+    accel_z: float
+
+def _expire_response(fut: Future[None]) -> None:
+    """Fail a response future that was not answered within its timeout."""
+    if not fut.done():
+        fut.set_exception(asyncio.TimeoutError())
 
 WrapFuncType = TypeVar("WrapFuncType", bound=Callable[..., Any])
 
@@ -133,12 +204,9 @@ def disconnect_on_missing_services(func: WrapFuncType) -> WrapFuncType:
         try:
             return await func(self, *args, **kwargs)
         except (BleakServiceMissing, BleakCharacteristicMissing):
-            try:
-                if self.client.is_connected:
-                    await self.client.clear_cache()
-                    await self.client.disconnect()
-            except Exception:
-                pass
+            # clear_cache can take seconds on BlueZ; clean up in the background and fail fast
+            if self._cleanup_task is None or self._cleanup_task.done():
+                self._cleanup_task = asyncio.create_task(self._clear_cache_and_disconnect())
             raise
 
     return wrapper  # type: ignore
@@ -147,26 +215,71 @@ def disconnect_on_missing_services(func: WrapFuncType) -> WrapFuncType:
 class McwClient:
     """BLE client for communicating with Magic Caster Wand."""
 
+    __slots__ = (
+        "client", "_write_gatt_char", "_command_char",
+        "callback_spell", "callback_battery", "callback_buttons", "callback_calibration", "callback_imu",
+        "_pending_responses", "_rx_queue", "_rx_dropped", "_rx_task", "_tx_queue", "_tx_task",
+        "_notify_ready", "_cleanup_task", "_last_button_mask", "_imu_scaled", "_parsers",
+        "_box_address", "_wand_challenge", "_wand_device_id", "_wand_firmware_version",
+        "_wand_serial_number", "_wand_sku", "_wand_type",
+    )
+
     def __init__(self, client: BleakClient) -> None:
         """Initialize the client."""
         self.client = client
+        # McwClient is recreated per connection, so the bound method never outlives its client
+        self._write_gatt_char = client.write_gatt_char
+        # Resolved to the characteristic object in start_notify so writes skip the per-call UUID lookup
+        self._command_char: BleakGATTCharacteristic | str = COMMAND_UUID
         self.callback_spell: Callable[[str], None] | None = None
         self.callback_battery: Callable[[float], None] | None = None
-        self.callback_buttons: Callable[[dict[str, bool]], None] | None = None
+        self.callback_buttons: Callable[[ButtonStates], None] | None = None
         self.callback_calibration: Callable[[dict[str, bool]], None] | None = None
-        self.callback_imu: Callable[[list[dict[str, float]]], None] | None = None
-        self.lock = asyncio.Lock()
+        self.callback_imu: Callable[[list[IMUReading]], None] | None = None
 
         self._box_address: str | None = None
-        self._waiting_cmd_event: Event = Event()
-        self._waiting_for_msg_id: int | None = None
+        self._pending_responses: dict[int, Future[None]] = {}
+        self._rx_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=_RX_QUEUE_SIZE)
+        # IMU payloads dropped in the current queue overflow; reported when the queue drains
+        self._rx_dropped: int = 0
+        self._rx_task: asyncio.Task[None] | None = None
+        self._tx_queue: asyncio.Queue[tuple[bytes, int | None, float, Future[None]]] = asyncio.Queue()
+        self._tx_task: asyncio.Task[None] | None = None
+        self._notify_ready: asyncio.Event = asyncio.Event()
+        self._cleanup_task: asyncio.Task[None] | None = None
+        self._last_button_mask: int = -1
+        # Scratch buffer for scaled IMU samples; the payload's sample count is a single byte
+        self._imu_scaled = np.empty((0xFF, 6), dtype=np.float64)
         self._wand_challenge: int | None = None
         self._wand_device_id: str | None = None
         self._wand_firmware_version: str | None = None
         self._wand_serial_number: str | None = None
         self._wand_sku: str | None = None
         self._wand_type: str | None = None
+
+        # Notification opcode -> (parser, minimum payload length), bound once so _handler is a
+        # single dict lookup; parsers assume the length has already been checked
+        self._parsers: dict[int, tuple[Callable[[memoryview], None], int]] = {
+            RESPONSEIDS.FIRMWARE_VERSION: (self._parse_firmware_version, 2),
+            RESPONSEIDS.CHALLENGE: (self._parse_challenge, 3),
+            RESPONSEIDS.BOX_ADDRESS: (self._parse_box_address, 7),
+            RESPONSEIDS.WAND_PRODUCT_INFORMATION: (self._parse_wand_information, 3),
+            RESPONSEIDS.BUTTON_PAYLOAD: (self._parse_buttons, 2),
+            RESPONSEIDS.SPELL_CAST: (self._parse_spell, 5),
+            RESPONSEIDS.IMU_PAYLOAD: (self._parse_imu_payload, 4),
+            RESPONSEIDS.BUTTON_CALIBRATION_BASELINE: (self._parse_calibration_button, 1),
+            RESPONSEIDS.IMU_CALIBRATION: (self._parse_calibration_imu, 1),
+        }
         
+    async def _clear_cache_and_disconnect(self) -> None:
+        """Clear the cached GATT services and disconnect, ignoring errors."""
+        try:
+            if self.client.is_connected:
+                await self.client.clear_cache()
+                await self.client.disconnect()
+        except Exception:
+            pass
+
     def is_connected(self) -> bool:
         """Check if client is connected."""
         return self.client.is_connected
@@ -175,11 +288,15 @@ class McwClient:
             self,
             spell_cb:  Callable[[str], None],
             battery_cb: Callable[[float], None],
-            buttons_cb: Callable[[dict[str, bool]], None],
+            buttons_cb: Callable[[ButtonStates], None],
             calibration_cb: Callable[[dict[str, bool]], None],
-            imu_cb: Callable[[list[dict[str, float]]], None]
+            imu_cb: Callable[[list[IMUReading]], None]
     ) -> None:
-        """Register callbacks for spell, battery, button, and calibration notifications."""
+        """Register callbacks for spell, battery, button, and calibration notifications.
+
+        Callbacks are called inline on the event loop, without a thread hop or context
+        copy, so they must not block; schedule slow work with asyncio.create_task.
+        """
         self.callback_spell = spell_cb
         self.callback_battery = battery_cb
         self.callback_buttons = buttons_cb
@@ -189,9 +306,26 @@ class McwClient:
     @disconnect_on_missing_services
     async def start_notify(self) -> None:
         """Start receiving notifications."""
+        command_char = self.client.services.get_characteristic(COMMAND_UUID)
+        if command_char is None:
+            raise BleakCharacteristicMissing(f"Characteristic {COMMAND_UUID} not found")
+        self._command_char = command_char
+
+        if self._rx_task is None or self._rx_task.done():
+            self._rx_task = asyncio.create_task(self._rx_consumer())
         await self.client.start_notify(NOTIFY_UUID, self._handler)
         await self.client.start_notify(BATTERY_UUID, self._handler_battery)
-        await sleep(1.0)
+
+        # Probe with a harmless read so the subscription is confirmed by its reply rather than
+        # waiting for the wand to notify on its own; the reply also caches the firmware version
+        if not self._notify_ready.is_set():
+            await self._write_raw(_PKT_FIRMWARE_VERSION_READ)
+
+        # Move on at the first notification, or after a second if none arrives
+        try:
+            await wait_for(self._notify_ready.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
 
         try:
             # Query initial battery level
@@ -208,89 +342,141 @@ class McwClient:
             await self.client.stop_notify(BATTERY_UUID)
         except Exception as err:
             _LOGGER.debug("Error stopping notifications: %s", err)
+        finally:
+            self.stop_background_tasks()
+
+    def stop_background_tasks(self) -> None:
+        """Cancel the notification consumer and command writer tasks.
+
+        Queued notifications are dropped. Callers still waiting on a queued or in-flight
+        command get a BleakError rather than a cancellation, so an ordinary disconnect is
+        handled by their usual error paths.
+        """
+        for task in (self._rx_task, self._tx_task):
+            if task is not None:
+                task.cancel()
+        self._rx_task = None
+        self._tx_task = None
+        while not self._rx_queue.empty():
+            self._rx_queue.get_nowait()
+        self._rx_dropped = 0
+        while not self._tx_queue.empty():
+            done = self._tx_queue.get_nowait()[3]
+            if not done.done():
+                done.set_exception(BleakError("Disconnected"))
+
+    async def _rx_consumer(self) -> None:
+        """Process queued notifications in arrival order."""
+        # Bound once; the loop runs for every notification while connected
+        queue = self._rx_queue
+        get = queue.get
+        process = self._process_notification
+        while True:
+            process(await get())
+            if self._rx_dropped and queue.empty():
+                _LOGGER.warning("Notification queue drained after dropping %d IMU payloads", self._rx_dropped)
+                self._rx_dropped = 0
 
     @disconnect_on_missing_services
-    async def write(self, uuid: str, data: bytes, response: bool = False) -> None:
+    async def write(self, uuid: BleakGATTCharacteristic | str, data: bytes, response: bool = False) -> None:
         """Write data to the specified characteristic."""
-        _LOGGER.debug("Write UUID=%s data=%s", uuid, data.hex())
-        await self.client.write_gatt_char(uuid, data, response)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Write UUID=%s data=%s", uuid, data.hex())
+        await self._write_gatt_char(uuid, data, response)
 
     def _handler_battery(self, _: Any, data: bytearray) -> None:
         """Handle battery notification."""
-        _LOGGER.debug("Battery received: %s", data.hex())
-        battery = int.from_bytes(data, byteorder="little")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Battery received: %s", data.hex())
+        if not self._notify_ready.is_set():
+            self._notify_ready.set()
+        if not data:
+            return
+        # Battery Level characteristic is a single uint8 percentage
         if self.callback_battery:
-            self.callback_battery(battery)
+            self.callback_battery(data[0])
 
     def _handler(self, _: Any, data: bytearray) -> None:
-        """Handle notification data."""
-        _LOGGER.debug("Received: %s", data.hex())
+        """Queue notification data for the consumer task.
 
-        if not data or len(data) < 1:
+        Runs inside bleak's receive path, so it only copies payloads that have a parser;
+        parsing and callbacks happen in _rx_consumer. When the queue is full the oldest
+        notification makes room for the newest: IMU payloads are dropped, anything else
+        (command responses included) is processed immediately.
+        """
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Received: %s", data.hex())
+
+        if not data:
             return
 
+        if not self._notify_ready.is_set():
+            self._notify_ready.set()
+
+        # Every awaited response has a parser, so anything else needs neither a copy nor a queue slot
         opcode = data[0]
+        if opcode not in self._parsers:
+            if opcode not in _QUIET_RESPONSES:
+                _LOGGER.debug("Unknown opcode: 0x%02X, length=%d", opcode, len(data))
+            return
 
+        payload = bytes(data)
         try:
-            if opcode == RESPONSEIDS.FIRMWARE_VERSION:
-                self._parse_firmware_version(data)
-
-            elif opcode == RESPONSEIDS.CHALLENGE:
-                self._parse_challenge(data)
-
-            elif opcode == RESPONSEIDS.BOX_ADDRESS:
-                self._parse_box_address(data)
-
-            elif opcode == RESPONSEIDS.WAND_PRODUCT_INFORMATION:
-                self._parse_wand_information(data)
-
-            elif opcode == RESPONSEIDS.BUTTON_PAYLOAD:
-                self._parse_buttons(data)
-
-            elif opcode == RESPONSEIDS.SPELL_CAST:
-                self._parse_spell(data)
-
-            elif opcode == RESPONSEIDS.IMU_PAYLOAD:
-                self._parse_imu_payload(data)
+            self._rx_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            oldest = self._rx_queue.get_nowait()
+            if oldest[0] == RESPONSEIDS.IMU_PAYLOAD:
+                if not self._rx_dropped:
+                    _LOGGER.warning("Notification queue full, dropping oldest IMU payloads; spell tracking may degrade")
+                self._rx_dropped += 1
+            else:
+                # Only stream data is expendable; the oldest entry is next in line anyway, so
+                # handling it here keeps order and still resolves any command waiting on it
+                self._process_notification(oldest)
+            self._rx_queue.put_nowait(payload)
 
-            elif opcode == RESPONSEIDS.BUTTON_CALIBRATION_BASELINE or opcode == RESPONSEIDS.IMU_CALIBRATION:
-                self._parse_calibration(data)
+    def _process_notification(self, data: bytes) -> None:
+        """Parse a notification and signal any command waiting on it."""
+        opcode = data[0]
 
+        try:
+            # _handler only queues opcodes that have a parser
+            parser, min_length = self._parsers[opcode]
+            if len(data) < min_length:
+                _LOGGER.debug("Truncated payload for opcode 0x%02X, length=%d", opcode, len(data))
             else:
-                _LOGGER.debug("Unknown opcode: 0x%02X, length=%d", opcode, len(data))
+                # Parsers slice a zero-copy view rather than copying the payload
+                parser(memoryview(data))
 
         except Exception as e:
             _LOGGER.error("Error in message handler for opcode 0x%02X: %s", opcode, e)
             _LOGGER.debug("Stack trace:", exc_info=True)
 
         # Signal waiting command if this message matches expected response
-        if self._waiting_for_msg_id is not None and opcode == self._waiting_for_msg_id:
-            _LOGGER.debug("Received expected response 0x%02X, signaling caller", opcode)
-            self._waiting_cmd_event.set()
-            self._waiting_for_msg_id = None
+        if self._pending_responses:
+            fut = self._pending_responses.pop(opcode, None)
+            if fut is not None and not fut.done():
+                _LOGGER.debug("Received expected response 0x%02X, signaling caller", opcode)
+                fut.set_result(None)
 
-    def _parse_spell(self, data: bytearray) -> None:
+    def _parse_spell(self, data: memoryview) -> None:
         """Parse spell data from notification."""
-        try:
-            if len(data) < 5:
-                return
-
-            spell_len = data[3]
-            raw_name = data[4 : 4 + spell_len]
-            spell_name = raw_name.decode("utf-8", errors="ignore").strip()
-            spell_name = spell_name.replace("\x00", "").replace("_", " ")
+        callback = self.callback_spell
+        if callback is None and not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
 
-            if not spell_name:
-                return
+        spell_len = data[3]
+        raw_name = bytes(data[4 : 4 + spell_len]).translate(_SPELL_NAME_TABLE, b"\x00")
+        spell_name = raw_name.decode("utf-8", errors="ignore").strip()
 
-            _LOGGER.debug("Spell detected: %s", spell_name)
-            if self.callback_spell:
-                self.callback_spell(spell_name)
+        if not spell_name:
+            return
 
-        except Exception as err:
-            _LOGGER.warning("Spell parse error: %s", err)
+        _LOGGER.debug("Spell detected: %s", spell_name)
+        if callback:
+            callback(spell_name)
 
-    def _parse_buttons(self, data: bytearray) -> None:
+    def _parse_buttons(self, data: memoryview) -> None:
         """Parse button states from notification.
         
         Format: [0x10, Mask]
@@ -300,159 +486,185 @@ class McwClient:
             0x04: Button 3
             0x08: Button 4
         """
-        try:
-            if len(data) < 2:
-                return
+        callback = self.callback_buttons
+        if callback is None and not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
 
-            mask = data[1]
-            button_states = {
-                "button_1": bool(mask & 0x01),
-                "button_2": bool(mask & 0x02),
-                "button_3": bool(mask & 0x04),
-                "button_4": bool(mask & 0x08),
-                "button_all": (mask & 0x0F) == 0x0F,
-            }
+        mask = data[1] & 0x0F
+        # Firmware repeats the payload while buttons are held; only report changes
+        if mask == self._last_button_mask:
+            return
+        self._last_button_mask = mask
+
+        button_states = _BUTTON_STATES[mask]
 
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug("Button states: %s (mask=0x%02X)", button_states, mask)
-            if self.callback_buttons:
-                self.callback_buttons(button_states)
+        if callback:
+            callback(button_states)
 
-        except Exception as err:
-            _LOGGER.warning("Button parse error: %s", err)
+    def _parse_calibration_button(self, data: memoryview) -> None:
+        """Parse button calibration confirmation (ID 0xFB)"""
+        _LOGGER.debug("Button calibration confirmed (FB response)")
+        if self.callback_calibration is not None:
+            self.callback_calibration(_CALIBRATION_BUTTON_DONE)
 
-    def _parse_calibration(self, data: bytearray) -> None:
-        """Parse calibration response from notification.
-        
-        Format:
-            0xFB: Button calibration confirmed
-            0xFC: IMU calibration confirmed
-        """
-        try:
-            if len(data) < 1:
-                return
+    def _parse_calibration_imu(self, data: memoryview) -> None:
+        """Parse IMU calibration confirmation (ID 0xFC)"""
+        _LOGGER.debug("IMU calibration confirmed (FC response)")
+        if self.callback_calibration is not None:
+            self.callback_calibration(_CALIBRATION_IMU_DONE)
 
-            opcode = data[0]
-            if opcode == 0xFB:
-                _LOGGER.debug("Button calibration confirmed (FB response)")
-                if self.callback_calibration:
-                    self.callback_calibration({"calibration_button": "Done"})
-            elif opcode == 0xFC:
-                _LOGGER.debug("IMU calibration confirmed (FC response)")
-                if self.callback_calibration:
-                    self.callback_calibration({"calibration_imu": "Done"})
+    async def write_command(self, packet: bytes, timeout: float = 5.0) -> None:
+        """Write command and optionally wait for response.
 
-        except Exception as err:
-            _LOGGER.warning("Calibration parse error: %s", err)
+        Commands are queued to a single writer task so they reach the wand one at a time
+        and in submission order.
+        """
+        if not packet:
+            raise ValueError("Empty packet")
+
+        await self._queue_command(packet, timeout)
+
+    def _queue_command(self, packet: bytes, timeout: float = 5.0) -> Future[None]:
+        """Queue a command for the writer task and return the future it resolves."""
+        # Command ID is the first byte; it determines whether a response is expected
+        expected_msg_id: int | None = MESSAGE_TO_RESPONSE_MAP.get(packet[0])
+
+        if self._tx_task is None or self._tx_task.done():
+            self._tx_task = asyncio.create_task(self._tx_worker())
+
+        done: Future[None] = asyncio.get_running_loop().create_future()
+        self._tx_queue.put_nowait((packet, expected_msg_id, timeout, done))
+        return done
+
+    async def _tx_worker(self) -> None:
+        """Send queued commands one at a time, resolving each caller's future."""
+        while True:
+            packet, expected_msg_id, timeout, done = await self._tx_queue.get()
+            if done.done():
+                # Caller gave up before its turn
+                continue
+            try:
+                await self._send_command(packet, expected_msg_id, timeout)
+            except asyncio.CancelledError:
+                # Only stop_background_tasks cancels the writer; fail the caller, don't cancel it
+                if not done.done():
+                    done.set_exception(BleakError("Disconnected"))
+                raise
+            except Exception as err:
+                if not done.done():
+                    done.set_exception(err)
+            else:
+                if not done.done():
+                    done.set_result(None)
 
-    async def write_command(self, packet: bytes, timeout: float = 5.0) -> None:
-        """Write command and optionally wait for response."""
-        async with self.lock:
-            max_retries = 3
-
-            # Extract command ID from packet (first byte)
-            cmd_id = packet[0] if len(packet) > 0 else None
-            if cmd_id is None:
-                raise ValueError("Empty packet")
-
-            # Check if this command expects a response
-            expected_msg_id: int | None = MESSAGE_TO_RESPONSE_MAP.get(cmd_id)
-            expects_response: bool = expected_msg_id is not None
-
-            for attempt in range(1, max_retries + 1):
-                try:
-                    if expects_response:
-                        _LOGGER.debug("Sending command 0x%02X, expecting response 0x%02X", cmd_id, expected_msg_id)
-                        self._waiting_cmd_event.clear()
-                        self._waiting_for_msg_id = expected_msg_id
-                    else:
-                        _LOGGER.debug("Sending command 0x%02X (no response expected)", cmd_id)
-
-                    await self.write(COMMAND_UUID, packet, False)
-
-                    if expects_response:
-                        await wait_for(self._waiting_cmd_event.wait(), timeout)
-                        _LOGGER.debug("Command 0x%02X completed successfully", cmd_id)
-                    
-                    return
-                except Exception as err:
-                    if attempt < max_retries:
-                        _LOGGER.warning(
-                            "Write retry (attempt %d/%d): %s", attempt, max_retries, err
-                        )
-                        await sleep(0.5)
-                    else:
-                        raise
+    async def _send_command(self, packet: bytes, expected_msg_id: int | None, timeout: float) -> None:
+        """Write a command, retrying on failure, and wait for its response if one is expected."""
+        cmd_id = packet[0]
+        loop = asyncio.get_running_loop() if expected_msg_id is not None else None
+
+        for attempt in range(1, _WRITE_MAX_RETRIES + 1):
+            try:
+                fut: Future[None] | None = None
+                if expected_msg_id is not None:
+                    _LOGGER.debug("Sending command 0x%02X, expecting response 0x%02X", cmd_id, expected_msg_id)
+                    fut = loop.create_future()
+                    self._pending_responses[expected_msg_id] = fut
+                else:
+                    _LOGGER.debug("Sending command 0x%02X (no response expected)", cmd_id)
+
+                await self.write(self._command_char, packet, False)
+
+                if fut is not None:
+                    expiry = loop.call_later(timeout, _expire_response, fut)
+                    try:
+                        await fut
+                    finally:
+                        expiry.cancel()
+                    _LOGGER.debug("Command 0x%02X completed successfully", cmd_id)
+                
+                return
+            except Exception as err:
+                if fut is not None and self._pending_responses.get(expected_msg_id) is fut:
+                    del self._pending_responses[expected_msg_id]
+
+                if attempt < _WRITE_MAX_RETRIES:
+                    _LOGGER.warning(
+                        "Write retry (attempt %d/%d): %s", attempt, _WRITE_MAX_RETRIES, err
+                    )
+                    await sleep(0.5)
+                else:
+                    raise
+
+    async def _write_raw(self, packet: bytes) -> None:
+        """Write a packet directly, bypassing the command queue, retries and response tracking.
+
+        Any reply is handled like an unsolicited notification: parsed, with nothing waiting on it.
+        """
+        await self.write(self._command_char, packet, False)
 
     async def imu_streaming_start(self) -> None:
         """Start IMU data streaming"""
         _LOGGER.debug("Starting IMU streaming")
-        await self.write_command(struct.pack('B', MESSAGEIDS.IMUFLAG_RESET), False)
+        await self.write_command(_PKT_IMU_STREAM_STOP, False)
         await sleep(0.1)
-        await self.write_command(struct.pack('BBB', MESSAGEIDS.IMUFLAG_SET, 0x00, 0x80), False)
+        await self.write_command(_PKT_IMU_STREAM_START, False)
 
     async def imu_streaming_stop(self) -> None:
         """Stop IMU data streaming"""
         _LOGGER.debug("Stopping IMU streaming")
-        await self.write_command(struct.pack('B', MESSAGEIDS.IMUFLAG_RESET), False)
+        await self.write_command(_PKT_IMU_STREAM_STOP, False)
 
     async def init_wand(self) -> None:
         """Initialize the wand."""
-        commands = [
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x00, 0x05),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x01, 0x05),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x02, 0x05),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x03, 0x05),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x04, 0x08),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x05, 0x08),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x06, 0x08),
-            struct.pack("BBB", MESSAGEIDS.BUTTON_SET_THRESHOLD, 0x07, 0x08),
-        ]
-        for cmd in commands:
-            await self.write_command(cmd)
+        # Queued in one step so no other command interleaves with the sequence; the writer
+        # sends the packets in order, with its usual retries
+        await asyncio.gather(*[self._queue_command(cmd) for cmd in _PKT_INIT_WAND])
 
     async def challenge(self) -> int:
         """Send challenge command."""
-        await self.write_command(struct.pack("B", MESSAGEIDS.CHALLENGE))
+        await self.write_command(_PKT_CHALLENGE)
         return self._wand_challenge or 0
     
     async def calibration_button(self) -> None:
         """Send button calibration commands."""
-        await self.write_command(struct.pack("BBB", MESSAGEIDS.FACTORY_UNLOCK, 0x55, 0xAA))
-        await self.write_command(struct.pack("B", MESSAGEIDS.BUTTON_CALIBRATION_BASELINE))
+        await self.write_command(_PKT_FACTORY_UNLOCK)
+        await self.write_command(_PKT_BUTTON_CALIBRATION)
 
     async def calibration_imu(self) -> None:
         """Send IMU calibration commands."""
-        await self.write_command(struct.pack("BBB", MESSAGEIDS.FACTORY_UNLOCK, 0x55, 0xAA))
-        await self.write_command(struct.pack("B", MESSAGEIDS.IMU_CALIBRATION))
+        await self.write_command(_PKT_FACTORY_UNLOCK)
+        await self.write_command(_PKT_IMU_CALIBRATION)
 
     async def get_box_address(self) -> str:
         """Get box BLE address."""
         if self._box_address is None:
-            await self.write_command(struct.pack("B", MESSAGEIDS.BOX_ADDRESS_READ))
+            await self.write_command(_PKT_BOX_ADDRESS_READ)
         return self._box_address or ""
 
     async def get_wand_device_id(self) -> str:
         """Get wand device ID."""
         if self._wand_device_id is None:
-            await self.write_command(struct.pack("BB", MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ, 0x04))
+            await self.write_command(_PKT_WAND_DEVICE_ID_READ)
         return self._wand_device_id or ""
 
     async def get_wand_firmware_version(self) -> str:
         """Get wand firmware version."""
         if self._wand_firmware_version is None:
-            await self.write_command(struct.pack("B", MESSAGEIDS.FIRMWARE_VERSION_READ))
+            await self.write_command(_PKT_FIRMWARE_VERSION_READ)
         return self._wand_firmware_version or ""
 
     async def get_wand_serial_number(self) -> str:
         """Get wand serial number."""
         if self._wand_serial_number is None:
-            await self.write_command(struct.pack("BB", MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ, 0x01))
+            await self.write_command(_PKT_WAND_SERIAL_NUMBER_READ)
         return self._wand_serial_number or ""
     
     async def get_wand_sku(self) -> str:
         """Get wand SKU."""
         if self._wand_sku is None:
-            await self.write_command(struct.pack("BB", MESSAGEIDS.WAND_PRODUCT_INFORMATION_READ, 0x02))
+            await self.write_command(_PKT_WAND_SKU_READ)
         return self._wand_sku or ""
 
     async def get_wand_type(self) -> str:
@@ -466,67 +678,60 @@ class McwClient:
         _LOGGER.debug("Setting LED %s color to R=%d G=%d B=%d", group.name, r, g, b)
 
         # Macros groups don't match with this - this hacky lets us have a common interface while we figure it out
-        converted_group: int = int(group)
-        match converted_group:
-            case 1:
-                converted_group = 3
-            case 3:
-                converted_group = 1
+        converted_group = _LED_GROUP_REMAP[group]
 
-        await self.write_command(struct.pack('BBBBB', MESSAGEIDS.LIGHT_CONTROL_SET_LED, converted_group, r, g, b))
+        await self.write_command(_LED_PACK(MESSAGEIDS.LIGHT_CONTROL_SET_LED, converted_group, r, g, b))
 
     async def led_off(self) -> None:
         """Turn off wand LED"""
         _LOGGER.debug("Turning off LED")
-        await self.write_command(struct.pack('B', MESSAGEIDS.LIGHT_CONTROL_CLEAR_ALL))
+        await self.write_command(_PKT_LED_CLEAR_ALL)
 
     async def send_macro(self, macro: Macro) -> None:
         """Send a macro sequence to the wand."""
         await self.write_command(macro.to_bytes())
 
+    async def set_led(self, group: LedGroup, r: int, g: int, b: int, duration_ms: int = 0) -> None:
+        """Transition an LED group to a color."""
+        await self.write_command(_MACRO_SET_LED_PACK(
+            MACROIDS.CONTROL, MACROIDS.LIGHT_CONTROL_TRANSITION, group, r & 0xFF, g & 0xFF, b & 0xFF, duration_ms
+        ))
+
+    async def clear_leds(self) -> None:
+        """Clear all LEDs."""
+        await self.write_command(_PKT_MACRO_CLEAR_LEDS)
+
     async def buzz(self, duration_ms: int) -> None:
         """Vibrate the wand."""
-        macro = Macro().add_buzz(duration_ms)
-        await self.send_macro(macro)
+        await self.write_command(_MACRO_BUZZ_PACK(MACROIDS.CONTROL, MACROIDS.HAP_BUZZ, duration_ms))
 
-    def _parse_box_address(self, data: bytearray) -> None:
+    def _parse_box_address(self, data: memoryview) -> None:
         """Parse box address (ID 0x09)"""
-        if len(data) < 7:
-            return
-        try:
-            mac_le = data[1:7]
-            mac_be = mac_le[::-1]
-            self._box_address = ":".join(f"{b:02X}" for b in mac_be)
-            _LOGGER.debug("Box address: %s", self._box_address)
-        except Exception as e:
-            _LOGGER.error("Error parsing box address: %s", e)
+        # Little-endian on the wire; reversed view of bytes 6..1 is big-endian
+        self._box_address = data[6:0:-1].hex(":").upper()
+        _LOGGER.debug("Box address: %s", self._box_address)
 
-    def _parse_challenge(self, data: bytearray) -> None:
+    def _parse_challenge(self, data: memoryview) -> None:
         """Parse challenge response (ID 0x01)"""
         if len(data) == 3:
-            self._wand_challenge = struct.unpack('<H', data[1:3])[0]
+            self._wand_challenge = int.from_bytes(data[1:3], byteorder="little")
 
-    def _parse_firmware_version(self, data: bytearray) -> None:
+    def _parse_firmware_version(self, data: memoryview) -> None:
         """Parse firmware version message (ID 0x00)
 
         Response format: [0x00] [version_bytes...]
         """
-        if len(data) < 2:
-            return
-        try:
-            # Skip first byte (opcode)
-            version_bytes = data[1:]
+        # Skip first byte (opcode)
+        version_bytes = data[1:]
 
-            # Convert bytes to dotted version string (decimal values)
-            # e.g., [0, 3] -> "0.3", [1, 2, 3] -> "1.2.3"
-            version = ".".join(str(b) for b in version_bytes)
+        # Convert bytes to dotted version string (decimal values)
+        # e.g., [0, 3] -> "0.3", [1, 2, 3] -> "1.2.3"
+        version = ".".join(str(b) for b in version_bytes)
 
-            _LOGGER.debug("Firmware version: %s", version)
-            self._wand_firmware_version = version
-        except Exception as e:
-            _LOGGER.error("Error parsing firmware version: %s", e)
+        _LOGGER.debug("Firmware version: %s", version)
+        self._wand_firmware_version = version
 
-    def _parse_imu_payload(self, data: bytearray) -> None:
+    def _parse_imu_payload(self, data: memoryview) -> None:
         """Parse IMU data message (ID 0x2C)
 
         Based on Android IMUPayloadMessage.kt:
@@ -538,8 +743,8 @@ class McwClient:
         Each sample contains 6 shorts (little-endian):
         - gyroX, gyroY, gyroZ, accelX, accelY, accelZ
         """
-        if len(data) < 4:
-            _LOGGER.warning("Invalid IMU payload length: %d", len(data))
+        callback = self.callback_imu
+        if callback is None and not _LOGGER.isEnabledFor(logging.DEBUG):
             return
 
         # Extract header
@@ -557,65 +762,37 @@ class McwClient:
             _LOGGER.warning("IMU payload length not divisible by 12: %d", payload_length)
             return
 
-        samples = []
-        offset = 4
+        if sample_count == 0:
+            return
 
-        for i in range(sample_count):
-            try:
-                # Parse 6 shorts (little-endian) - 12 bytes total
-                gyro_x = struct.unpack_from('<h', data, offset)[0]
-                gyro_y = struct.unpack_from('<h', data, offset+2)[0]
-                gyro_z = struct.unpack_from('<h', data, offset+4)[0]
-                accel_x = struct.unpack_from('<h', data, offset+6)[0]
-                accel_y = struct.unpack_from('<h', data, offset+8)[0]
-                accel_z = struct.unpack_from('<h', data, offset+10)[0]
-
-                sample = IMUSample(gyro_x, gyro_y, gyro_z, accel_x, accel_y, accel_z)
-                samples.append(sample)
-
-                offset += 12
-            except Exception as e:
-                _LOGGER.error("Error parsing IMU sample %d: %s", i, e)
-                break
-
-        if samples:
-            _LOGGER.debug("Parsed %d IMU samples", len(samples))
-            if self.callback_imu:
-                # Send scaled data
-                imu_data = []
-                for sample in samples:
-                    accel = sample.get_scaled_accel()
-                    gyro = sample.get_scaled_gyro()
-                    imu_data.append({
-                        'accel_x': accel[0],
-                        'accel_y': accel[1],
-                        'accel_z': accel[2],
-                        'gyro_x': gyro[0],
-                        'gyro_y': gyro[1],
-                        'gyro_z': gyro[2],
-                    })
-                self.callback_imu(imu_data)
-
-    def _parse_wand_information(self, data: bytearray) -> None:
+        # Decode all samples in one pass: rows of (gyroX, gyroY, gyroZ, accelX, accelY, accelZ)
+        raw = np.frombuffer(data, dtype=_IMU_SAMPLE_DTYPE, count=sample_count, offset=4)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Parsed %d IMU samples (gyro xyz, accel xyz): %s", sample_count, raw.tolist())
+        if callback:
+            # Send scaled data
+            scaled = np.multiply(raw, _IMU_SCALE, out=self._imu_scaled[:sample_count])
+            callback([
+                IMUReading(gyro_x=gx, gyro_y=gy, gyro_z=gz, accel_x=ax, accel_y=ay, accel_z=az)
+                for gx, gy, gz, ax, ay, az in scaled.tolist()
+            ])
+
+    def _parse_wand_information(self, data: memoryview) -> None:
         """Parse wand information message (ID 0x0E)"""
-        if len(data) < 3:
-            return
-        try:
-            info_type = data[1]
-
-            if info_type == 0x01:
-                if len(data) >= 6:
-                    serial = struct.unpack('<I', data[2:6])[0]
-                    self._wand_serial_number = str(serial)
-                    _LOGGER.debug("Wand serial number: %s", self._wand_serial_number)
-            elif info_type == 0x02:
-                self._wand_sku = data[2:].decode('ascii', errors='ignore').strip('\x00')
-                _LOGGER.debug("Wand SKU: %s", self._wand_sku)
-            elif info_type == 0x04:
-                self._wand_device_id = data[2:].decode('ascii', errors='ignore').strip('\x00')
-                _LOGGER.debug("Wand device id: %s", self._wand_device_id)
-        except Exception as e:
-            _LOGGER.error("Error parsing wand information: %s", e)
+        info_type = data[1]
+
+        if info_type == 0x01:
+            if len(data) >= 6:
+                serial = int.from_bytes(data[2:6], byteorder="little")
+                self._wand_serial_number = str(serial)
+                _LOGGER.debug("Wand serial number: %s", self._wand_serial_number)
+        elif info_type == 0x02:
+            self._wand_sku = str(data[2:], 'ascii', errors='ignore').strip('\x00')
+            _LOGGER.debug("Wand SKU: %s", self._wand_sku)
+        elif info_type == 0x04:
+            self._wand_device_id = str(data[2:], 'ascii', errors='ignore').strip('\x00')
+            _LOGGER.debug("Wand device id: %s", self._wand_device_id)
 
     def _wand_device_id_to_type(self, device_id: str) -> str:
         """Extract wand type from device ID string
@@ -635,17 +812,5 @@ class McwClient:
             return "UNKNOWN"
 
         # Extract type suffix: drop last char, take last 2
-        # Example: "WBMC22G1SHNW" -> "WBMC22G1SHN" -> "HN"
-        type_suffix = device_id[:-1][-2:]
-
-        # Map suffix to wand type (from WandType.kt)
-        type_mapping = {
-            "DF": "DEFIANT",
-            "LY": "LOYAL",
-            "HR": "HEROIC",
-            "HN": "HONOURABLE",
-            "AV": "ADVENTUROUS",
-            "WS": "WISE",
-        }
-
-        return type_mapping.get(type_suffix, "UNKNOWN")
+        # Example: "WBMC22G1SHNW" -> "HN"
+        return _WAND_TYPE_MAP.get(device_id[-3:-1], "UNKNOWN")
@@ -3,6 +3,7 @@
 import asyncio
 import dataclasses
 import logging
+from typing import Awaitable, Callable
 
 from bleak import BleakClient
 from bleak.backends.device import BLEDevice
@@ -10,13 +11,22 @@ from bleak_retry_connector import establish_connection
 from bluetooth_sensor_state_data import BluetoothData
 from home_assistant_bluetooth import BluetoothServiceInfoBleak
 
-from .mcw import McwClient, LedGroup, Macro
+from .mcw import ButtonStates, IMUReading, McwClient, LedGroup, Macro
 from .remote_tensor_spell_detector import RemoteTensorSpellDetector
 from .spell_tracker import SpellTracker
 
 _LOGGER = logging.getLogger(__name__)
 
-@dataclasses.dataclass
+# Published on disconnect; shared, so never mutated
+_ALL_BUTTONS_RELEASED = ButtonStates(
+    button_1=False,
+    button_2=False,
+    button_3=False,
+    button_4=False,
+    button_all=False,
+)
+
+@dataclasses.dataclass(slots=True)
 class BLEData:
     """Response data with information about the Magic Caster Wand device."""
 
@@ -28,19 +38,29 @@ class BLEData:
     model: str = ""
     serial_number: str = ""
     sensors: dict[str, str | float | None] = dataclasses.field(
-        default_factory=lambda: {}
+        default_factory=dict
     )
 
 
 class McwDevice:
     """Data handler for Magic Caster Wand BLE device."""
 
+    __slots__ = (
+        "address", "tflite_url", "model_name", "client", "model", "_connected", "_mcw", "_data",
+        "_coordinator_spell", "_coordinator_battery", "_coordinator_buttons",
+        "_coordinator_calibration", "_coordinator_imu", "_coordinator_connection",
+        "_spell_tracker", "_button_all_pressed", "_last_button_states", "_spell_reset_timeout_task",
+        "_led_queue", "_led_task", "_casting_led_color", "_server_reachable",
+    )
+
     def __init__(self, address: str, tflite_url: str = "http://b5e3f765-tflite-server:8000", model_name: str = "model.tflite") -> None:
         """Initialize the device."""
         self.address = address
         self.tflite_url = tflite_url
         self.model_name = model_name
         self.client: BleakClient | None = None
+        # Mirrors client.is_connected; kept current by connect/disconnect and bleak's disconnected callback
+        self._connected: bool = False
         self.model: str | None = None
         self._mcw: McwClient | None = None
         self._data = BLEData()
@@ -52,7 +72,13 @@ class McwDevice:
         self._coordinator_connection = None
         self._spell_tracker: SpellTracker | None = None
         self._button_all_pressed: bool = False
+        # Last states pushed to the buttons coordinator, to skip republishing identical states
+        self._last_button_states: ButtonStates | None = None
         self._spell_reset_timeout_task: asyncio.Task[None] | None = None
+        # Casting LED changes from button transitions, applied in order by a single worker task
+        self._led_queue: asyncio.Queue[Callable[[], Awaitable[None]]] = asyncio.Queue()
+        self._led_task: asyncio.Task[None] | None = None
+        # Macro still collecting steps, and the future resolved once it has been written
         self._casting_led_color: tuple[int, int, int] = (0, 0, 255)  # Default color: blue
         self._server_reachable: bool = False
 
@@ -90,9 +116,10 @@ class McwDevice:
         if self._coordinator_battery:
             self._coordinator_battery.async_set_updated_data(data)
 
-    def _callback_buttons(self, data: dict[str, bool]) -> None:
+    def _callback_buttons(self, data: ButtonStates) -> None:
         """Handle button state update callback."""
-        if self._coordinator_buttons:
+        if self._coordinator_buttons and data != self._last_button_states:
+            self._last_button_states = data
             self._coordinator_buttons.async_set_updated_data(data)
 
         # Handle spell tracking start/stop when using server-side detection
@@ -102,17 +129,37 @@ class McwDevice:
             # Transition: not pressed -> pressed = start tracking
             if button_all and not self._button_all_pressed:
                 _LOGGER.debug("All buttons pressed, starting spell tracking")
-                asyncio.create_task(self._turn_on_casting_led())
+                self._queue_led_op(self._turn_on_casting_led)
                 self._spell_tracker.start()
 
             # Transition: pressed -> not pressed = stop tracking and detect spell
             elif not button_all and self._button_all_pressed:
                 _LOGGER.debug("Buttons released, stopping spell tracking")
-                asyncio.create_task(self._turn_off_casting_led())
+                self._queue_led_op(self._turn_off_casting_led)
                 asyncio.create_task(self._async_stop_and_detect_spell())
 
             self._button_all_pressed = button_all
 
+    def _queue_led_op(self, op: Callable[[], Awaitable[None]]) -> None:
+        """Queue a casting LED change, starting the worker if it is not running."""
+        if self._led_task is None or self._led_task.done():
+            self._led_task = asyncio.create_task(self._led_worker())
+        self._led_queue.put_nowait(op)
+
+    async def _led_worker(self) -> None:
+        """Apply queued casting LED changes one at a time."""
+        while True:
+            op = await self._led_queue.get()
+            await op()
+
+    def _stop_led_worker(self) -> None:
+        """Cancel the LED worker and drop any LED changes still queued."""
+        if self._led_task is not None:
+            self._led_task.cancel()
+            self._led_task = None
+        while not self._led_queue.empty():
+            self._led_queue.get_nowait()
+
     async def _async_stop_and_detect_spell(self) -> None:
         """Stop spell tracking and detect spell asynchronously."""
         if self._spell_tracker is None:
@@ -148,14 +195,16 @@ class McwDevice:
         if self._coordinator_calibration:
             self._coordinator_calibration.async_set_updated_data(data)
 
-    def _callback_imu(self, data: list[dict[str, float]]) -> None:
+    def _callback_imu(self, data: list[IMUReading]) -> None:
         """Handle IMU data update callback."""
         if self._coordinator_imu:
             self._coordinator_imu.async_set_updated_data(data)
 
         if self._spell_tracker is not None and self._spell_tracker.detector is not None and self._spell_tracker.detector.is_active:
+            # Plain-float samples straight from the client; the filter is sequential per sample
+            update = self._spell_tracker.update
             for sample in data:
-                self._spell_tracker.update(
+                update(
                     ax=sample['accel_y'],
                     ay=-sample['accel_x'],
                     az=sample['accel_z'],
@@ -167,6 +216,10 @@ class McwDevice:
     def _on_disconnect(self, client: BleakClient) -> None:
         """Handle BLE device disconnection."""
         _LOGGER.debug("Disconnected from Magic Caster Wand")
+        self._connected = False
+        self._stop_led_worker()
+        if self._mcw:
+            self._mcw.stop_background_tasks()
         self.client = None
         self._mcw = None
         if self._coordinator_connection:
@@ -174,12 +227,7 @@ class McwDevice:
 
     def is_connected(self) -> bool:
         """Check if the device is currently connected."""
-        if self.client:
-            try:
-                return self.client.is_connected
-            except Exception:
-                pass
-        return False
+        return self._connected
 
     async def connect(self, ble_device: BLEDevice) -> bool:
         """Connect to the BLE device."""
@@ -194,6 +242,7 @@ class McwDevice:
 
             if not self.client.is_connected:
                 return False
+            self._connected = True
 
             # Update basic device info
             if not self._data.name:
@@ -240,22 +289,18 @@ class McwDevice:
             except Exception as err:
                 _LOGGER.warning("Error during disconnect: %s", err)
             finally:
+                self._connected = False
                 # Reset all states on disconnect
-                if self._coordinator_buttons:
-                    self._coordinator_buttons.async_set_updated_data({
-                        "button_1": False,
-                        "button_2": False,
-                        "button_3": False,
-                        "button_4": False,
-                        "button_all": False,
-                    })
+                if self._coordinator_buttons and self._last_button_states != _ALL_BUTTONS_RELEASED:
+                    self._last_button_states = _ALL_BUTTONS_RELEASED
+                    self._coordinator_buttons.async_set_updated_data(_ALL_BUTTONS_RELEASED)
                 if self._coordinator_connection:
                     self._coordinator_connection.async_set_updated_data(False)
 
     async def update_device(self, ble_device: BLEDevice) -> BLEData:
         """Update device data. Sends keep-alive if connected."""
-        if ble_device and not self.model:
-            # Connect temporarily to fetch device info (model)
+        if ble_device and not self.model and not self.is_connected():
+            # Connect temporarily to fetch device info (model); never tear down a live connection
             if await self.connect(ble_device):
                 await self.disconnect()
         # Send keep-alive if connected
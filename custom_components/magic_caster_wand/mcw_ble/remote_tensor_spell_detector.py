@@ -1,13 +1,22 @@
 import logging
 import numpy as np
 import aiohttp
+import orjson
 
+from operator import itemgetter
 from typing import Any, Optional
 
 from .spell_detector import SpellDetector
 
 _LOGGER = logging.getLogger(__name__)
 
+# Idle seconds an inference connection is kept open, so spells cast a minute apart still reuse it
+_KEEPALIVE_TIMEOUT = 60.0
+
+_HEALTH_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=2.0)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 class RemoteTensorSpellDetector(SpellDetector):
     """Spell detector that delegates inference to a remote TensorFlow Lite server."""
 
@@ -23,8 +32,11 @@ class RemoteTensorSpellDetector(SpellDetector):
 
         self._base_url: str = base_url.rstrip("/")
         self._timeout: float = timeout
+        self._client_timeout = aiohttp.ClientTimeout(total=timeout)
         self._session: Optional[aiohttp.ClientSession] = session
         self._is_external_session: bool = session is not None
+        # Batched model input, filled in place on every detect
+        self._input_buf: np.ndarray = np.empty((1, 50, 2), dtype=np.float32)
 
         # Add .tflite extension if not present
         self._model_name: str = model_name if model_name.endswith(".tflite") else f"{model_name}.tflite"
@@ -37,7 +49,9 @@ class RemoteTensorSpellDetector(SpellDetector):
     async def async_init(self) -> None:
         """Initialize the detector asynchronously."""
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=2, keepalive_timeout=_KEEPALIVE_TIMEOUT),
+            )
         
         await self._initialize_model()
 
@@ -61,7 +75,7 @@ class RemoteTensorSpellDetector(SpellDetector):
         try:
             # Use the /api/health endpoint for a more reliable check
             url = f"{self._base_url}/api/health"
-            async with self._session.get(url, timeout=2.0) as resp:
+            async with self._session.get(url, timeout=_HEALTH_CHECK_TIMEOUT) as resp:
                 # 200 OK means the server is fully operational
                 return resp.status == 200
         except Exception as exc:
@@ -84,14 +98,23 @@ class RemoteTensorSpellDetector(SpellDetector):
         """
         _LOGGER.debug("Remote detect called with %d positions, threshold: %.2f", len(positions), confidence_threshold)
         
-        # Ensure session is initialized
+        # The session is opened by async_init; a per-call session would redo the TCP handshake
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            _LOGGER.warning("Remote detect called before async_init")
+            return None
+
+        # Checked explicitly: copyto would broadcast a smaller trace into the buffer
+        if np.shape(positions) != (50, 2):
+            _LOGGER.error("Invalid positions shape for remote detect: %s", np.shape(positions))
+            return None
 
         try:
+            np.copyto(self._input_buf[0], positions)
+            # orjson serializes the buffer in _invoke before its first await, so a later
+            # detect cannot overwrite it while this request is still being built
             payload = {
                 "model": self._model_name,
-                "input": positions.reshape(1, 50, 2).tolist(),
+                "input": self._input_buf,
             }
         except Exception as exc:  # pragma: no cover - defensive
             _LOGGER.error("Failed to prepare payload: %s", exc)
@@ -110,9 +133,8 @@ class RemoteTensorSpellDetector(SpellDetector):
             probs = probs[0]
 
         try:
-            probabilities = np.array(probs, dtype=np.float32)
-            best_index = int(np.argmax(probabilities))
-            best_prob = float(probabilities[best_index])
+            # Only a few dozen classes; a plain max avoids building an array just for argmax
+            best_index, best_prob = max(enumerate(map(float, probs)), key=itemgetter(1))
         except Exception as exc:  # pragma: no cover - defensive
             _LOGGER.warning("Invalid probabilities from remote server: %s", exc)
             return None
@@ -132,7 +154,7 @@ class RemoteTensorSpellDetector(SpellDetector):
         payload = {"model": self._model_name}
         
         _LOGGER.debug("Initializing model %s at %s", self._model_name, url)
-        async with self._session.post(url, json=payload, timeout=self._timeout) as resp:
+        async with self._session.post(url, json=payload, timeout=self._client_timeout) as resp:
             resp.raise_for_status()
             body = await resp.json()
             _LOGGER.info("Model %s initialized successfully: %s", self._model_name, body)
@@ -141,9 +163,14 @@ class RemoteTensorSpellDetector(SpellDetector):
         url = f"{self._base_url}/api/invoke"
         try:
             _LOGGER.debug("Sending remote invoke request to %s: %s", url, payload)
-            async with self._session.post(url, json=payload, timeout=self._timeout) as resp:
+            async with self._session.post(
+                url,
+                data=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                headers=_JSON_HEADERS,
+                timeout=self._client_timeout,
+            ) as resp:
                 resp.raise_for_status()
-                body = await resp.json()
+                body = orjson.loads(await resp.read())
                 _LOGGER.debug("Received remote invoke response: %s", body)
 
                 outputs = body.get("outputs") if isinstance(body, dict) else None
@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 class SpellDetector(ABC):
     """Base class for spell detection from normalized position data."""
 
-    SPELL_NAMES = [
+    SPELL_NAMES: tuple[str, ...] = (
         "The_Force_Spell",
         "Colloportus",
         "Colloshoo",
@@ -79,7 +79,7 @@ class SpellDetector(ABC):
         "The_Hour_Reversal_Charm",
         "Vermillious",
         "The_Pepper-Breath_Hex",
-    ]
+    )
 
     @abstractmethod
     async def detect(self, positions: np.ndarray, confidence_threshold: np.float32) -> str | None:
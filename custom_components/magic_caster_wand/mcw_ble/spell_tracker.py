@@ -1,4 +1,5 @@
 import logging
+import struct
 import numpy as np
 
 from dataclasses import dataclass, field
@@ -7,6 +8,9 @@ from .spell_detector import SpellDetector
 
 _LOGGER = logging.getLogger(__name__)
 
+_FLOAT32 = struct.Struct("<f")
+_UINT32 = struct.Struct("<I")
+
 @dataclass
 class SpellTrackerState:
     ahrs_quat_q0: np.float32 = 1.0
@@ -56,13 +60,17 @@ class SpellTracker:
         if not np.isfinite(x) or x <= SpellTracker._CONST_0_0:
             return SpellTracker._CONST_0_0
         x2 = SpellTracker._CONST_0_5 * x
-        # use ndarray view to avoid scalar .view limitations
-        y = np.array([x], dtype=np.float32)
-        i = y.view(np.uint32)
-        i[:] = np.uint32(0x5f3759df) - (i >> 1)
-        y = i.view(np.float32)
-        y = y * (SpellTracker._CONST_1_5 - (x2 * y * y))
-        return np.float32(y[0])
+        # Bit-cast through struct rather than a throwaway ndarray; the firmware's approximation is kept exactly
+        i = _UINT32.unpack(_FLOAT32.pack(x))[0]
+        y = np.float32(_FLOAT32.unpack(_UINT32.pack(0x5f3759df - (i >> 1)))[0])
+        return y * (SpellTracker._CONST_1_5 - (x2 * y * y))
+
+    @staticmethod
+    def _moved_sq(positions: np.ndarray, to_idx: np.ndarray, from_idx: np.ndarray) -> np.ndarray:
+        """Return the squared displacement between positions[to_idx] and positions[from_idx]."""
+        dx = positions[to_idx, 0] - positions[from_idx, 0]
+        dy = positions[to_idx, 1] - positions[from_idx, 1]
+        return dx * dx + dy * dy
 
     @staticmethod
     def _wrap_to_2pi(angle: np.float32) -> np.float32:
@@ -158,6 +166,8 @@ class SpellTracker:
         gy: np.float32,
         gz: np.float32
     ) -> tuple[np.float32, np.float32] | None:
+        # One attribute lookup per sample instead of one per state field access
+        state = self._state
 
         self._update_imu_only(
             gx,
@@ -168,12 +178,17 @@ class SpellTracker:
             az * SpellTracker._CONST_GRAVITY,
             np.float32(0.0042735))
 
-        if self._state.tracking_active != 1:
+        if state.tracking_active != 1:
             return None
 
+        start_z = state.start_pos_z
+        sq0, sq1, sq2, sq3 = state.start_quat_q0, state.start_quat_q1, state.start_quat_q2, state.start_quat_q3
+        iq0, iq1, iq2, iq3 = state.inv_quat_q0, state.inv_quat_q1, state.inv_quat_q2, state.inv_quat_q3
+        ref_x, ref_y, ref_z = state.ref_vec_x, state.ref_vec_y, state.ref_vec_z
+
         roll, pitch, yaw = self._calc_eulers_from_attitude()
 
-        fVar1: np.float32 = yaw - self._state.initial_yaw
+        fVar1: np.float32 = yaw - state.initial_yaw
 
         half_roll: np.float32 = roll * SpellTracker._CONST_0_5
         dStack_24: np.float32 = np.sin(half_roll)
@@ -198,56 +213,57 @@ class SpellTracker:
         fVar6: np.float32 = fVar7 * fVar11 * SpellTracker._CONST_0_0
         fVar8: np.float32 = fVar7 * fVar3 * SpellTracker._CONST_0_0
 
-        fVar4: np.float32 =((fVar10 - self._state.start_pos_z * fVar7 * fVar9) + fVar8) - fVar6
-        fVar1: np.float32 = ((fVar2 - self._state.start_pos_z * fVar7 * fVar5) - fVar6) - fVar8
-        fVar6: np.float32 = ((fVar6 + fVar2) - self._state.start_pos_z * fVar7 * fVar3) + fVar10
-        fVar10: np.float32 = (fVar7 * fVar11 * self._state.start_pos_z + fVar8 + fVar2) - fVar10
+        fVar4: np.float32 =((fVar10 - start_z * fVar7 * fVar9) + fVar8) - fVar6
+        fVar1: np.float32 = ((fVar2 - start_z * fVar7 * fVar5) - fVar6) - fVar8
+        fVar6: np.float32 = ((fVar6 + fVar2) - start_z * fVar7 * fVar3) + fVar10
+        fVar10: np.float32 = (fVar7 * fVar11 * start_z + fVar8 + fVar2) - fVar10
         fVar7: np.float32 = (fVar10 * fVar11 + fVar1 * fVar5 + fVar4 * fVar9) - fVar6 * fVar3
         fVar2: np.float32 = fVar4 * fVar3 + ((fVar1 * fVar11 + fVar6 * fVar9) - fVar10 * fVar5)
         fVar4: np.float32 = (fVar6 * fVar5 + fVar1 * fVar3 + fVar10 * fVar9) - fVar4 * fVar11
 
-        fVar6: np.float32 = SpellTracker._CONST_NEG_1_0 / (self._state.inv_quat_q3 * self._state.inv_quat_q3 + self._state.inv_quat_q2 * self._state.inv_quat_q2 + self._state.inv_quat_q1 * self._state.inv_quat_q1 + self._state.inv_quat_q0 * self._state.inv_quat_q0)
-        fVar8: np.float32 = self._state.inv_quat_q0 * fVar6
-        fVar5: np.float32 = self._state.inv_quat_q1 * fVar6
-        fVar3: np.float32 = self._state.inv_quat_q2 * fVar6
-        fVar6: np.float32 = fVar6 * self._state.inv_quat_q3
+        fVar6: np.float32 = SpellTracker._CONST_NEG_1_0 / (iq3 * iq3 + iq2 * iq2 + iq1 * iq1 + iq0 * iq0)
+        fVar8: np.float32 = iq0 * fVar6
+        fVar5: np.float32 = iq1 * fVar6
+        fVar3: np.float32 = iq2 * fVar6
+        fVar6: np.float32 = fVar6 * iq3
 
         fVar11: np.float32 = ((fVar8 * SpellTracker._CONST_NEG_0_0 - fVar5 * fVar7) - fVar3 * fVar2) - fVar6 * fVar4
         fVar1: np.float32 = (fVar6 * fVar2 + (fVar5 * SpellTracker._CONST_0_0 - fVar7 * fVar8)) - fVar3 * fVar4
         fVar12: np.float32 = fVar5 * fVar4 + ((fVar3 * SpellTracker._CONST_0_0 - fVar2 * fVar8) - fVar6 * fVar7)
         fVar2: np.float32 = (fVar3 * fVar7 + (fVar6 * SpellTracker._CONST_0_0 - fVar8 * fVar4)) - fVar5 * fVar2
 
-        fVar9: np.float32 = SpellTracker._CONST_NEG_1_0 / (self._state.start_quat_q3 * self._state.start_quat_q3 + self._state.start_quat_q2 * self._state.start_quat_q2 + self._state.start_quat_q1 * self._state.start_quat_q1 + self._state.start_quat_q0 * self._state.start_quat_q0)
-        fVar3: np.float32 = ((self._state.inv_quat_q2 * fVar2 + self._state.inv_quat_q1 * fVar11 + self._state.inv_quat_q0 * fVar1) - self._state.inv_quat_q3 * fVar12) - self._state.ref_vec_x
-        fVar7: np.float32 = self._state.start_quat_q0 * fVar9
-        fVar10: np.float32 = self._state.start_quat_q1 * fVar9
+        fVar9: np.float32 = SpellTracker._CONST_NEG_1_0 / (sq3 * sq3 + sq2 * sq2 + sq1 * sq1 + sq0 * sq0)
+        fVar3: np.float32 = ((iq2 * fVar2 + iq1 * fVar11 + iq0 * fVar1) - iq3 * fVar12) - ref_x
+        fVar7: np.float32 = sq0 * fVar9
+        fVar10: np.float32 = sq1 * fVar9
 
-        fVar4: np.float32 = (self._state.inv_quat_q3 * fVar1 + ((self._state.inv_quat_q2 * fVar11 + self._state.inv_quat_q0 * fVar12) - self._state.inv_quat_q1 * fVar2)) - self._state.ref_vec_y
-        fVar8: np.float32 = self._state.start_quat_q2 * fVar9
-        fVar5: np.float32 = ((fVar12 * self._state.inv_quat_q1 + fVar11 * self._state.inv_quat_q3 + fVar2 * self._state.inv_quat_q0) - fVar1 * self._state.inv_quat_q2) - self._state.ref_vec_z
-        fVar9: np.float32 = fVar9 * self._state.start_quat_q3
+        fVar4: np.float32 = (iq3 * fVar1 + ((iq2 * fVar11 + iq0 * fVar12) - iq1 * fVar2)) - ref_y
+        fVar8: np.float32 = sq2 * fVar9
+        fVar5: np.float32 = ((fVar12 * iq1 + fVar11 * iq3 + fVar2 * iq0) - fVar1 * iq2) - ref_z
+        fVar9: np.float32 = fVar9 * sq3
 
         fVar2: np.float32 = ((fVar7 * SpellTracker._CONST_NEG_0_0 - fVar10 * fVar3) - fVar8 * fVar4) - fVar9 * fVar5
         fVar1: np.float32 = (fVar9 * fVar4 + (fVar10 * SpellTracker._CONST_0_0 - fVar3 * fVar7)) - fVar8 * fVar5
         fVar6: np.float32 = fVar10 * fVar5 + ((fVar8 * SpellTracker._CONST_0_0 - fVar4 * fVar7) - fVar9 * fVar3)
         fVar4: np.float32 = (fVar8 * fVar3 + (fVar9 * SpellTracker._CONST_0_0 - fVar7 * fVar5)) - fVar10 * fVar4
 
-        fVar3: np.float32 = self._state.start_quat_q3 * fVar1 + ((self._state.start_quat_q2 * fVar2 + self._state.start_quat_q0 * fVar6) - self._state.start_quat_q1 * fVar4)
-        fVar1: np.float32 = (fVar6 * self._state.start_quat_q1 + fVar2 * self._state.start_quat_q3 + fVar4 * self._state.start_quat_q0) - fVar1 * self._state.start_quat_q2
+        fVar3: np.float32 = sq3 * fVar1 + ((sq2 * fVar2 + sq0 * fVar6) - sq1 * fVar4)
+        fVar1: np.float32 = (fVar6 * sq1 + fVar2 * sq3 + fVar4 * sq0) - fVar1 * sq2
 
-        if self._state.position_count < 0x2000:
-            self._state.positions[self._state.position_count] = (fVar3, fVar1)
-            self._state.position_count += 1
+        if state.position_count < 0x2000:
+            state.positions[state.position_count] = (fVar3, fVar1)
+            state.position_count += 1
 
         return (fVar3,fVar1)
 
     def _calc_eulers_from_attitude(
         self
     ) -> tuple[np.float32, np.float32, np.float32]:
-        qw: np.float32 = self._state.ahrs_quat_q0
-        qx: np.float32 = self._state.ahrs_quat_q1
-        qy: np.float32 = self._state.ahrs_quat_q2
-        qz: np.float32 = self._state.ahrs_quat_q3
+        state = self._state
+        qw: np.float32 = state.ahrs_quat_q0
+        qx: np.float32 = state.ahrs_quat_q1
+        qy: np.float32 = state.ahrs_quat_q2
+        qz: np.float32 = state.ahrs_quat_q3
 
         # Calculate roll
         sinroll_cospitch: np.float32 = SpellTracker._CONST_2_0 * (qy*qz + qw*qx)
@@ -283,12 +299,14 @@ class SpellTracker:
         az: np.float32,
         dt: np.float32
     ) -> None:
+        state = self._state
+        q0, q1, q2, q3 = state.ahrs_quat_q0, state.ahrs_quat_q1, state.ahrs_quat_q2, state.ahrs_quat_q3
         if ax != SpellTracker._CONST_0_0 or np.isnan(ax) or ay != SpellTracker._CONST_0_0 or np.isnan(ay) or az != SpellTracker._CONST_0_0 or np.isnan(az):
             fVar2: np.float32 = az * az + ay * ay + ax * ax
             fVar1: np.float32 = self._inv_sqrt(fVar2)
-            fVar3: np.float32 = self._state.ahrs_quat_q1 * self._state.ahrs_quat_q3 - self._state.ahrs_quat_q0 * self._state.ahrs_quat_q2
-            fVar2: np.float32 = self._state.ahrs_quat_q3 * self._state.ahrs_quat_q2 + self._state.ahrs_quat_q1 * self._state.ahrs_quat_q0
-            fVar4: np.float32 = self._state.ahrs_quat_q3 * self._state.ahrs_quat_q3 + self._state.ahrs_quat_q0 * self._state.ahrs_quat_q0 + SpellTracker._CONST_NEG_0_5
+            fVar3: np.float32 = q1 * q3 - q0 * q2
+            fVar2: np.float32 = q3 * q2 + q1 * q0
+            fVar4: np.float32 = q3 * q3 + q0 * q0 + SpellTracker._CONST_NEG_0_5
             gx: np.float32 = gx + (ay * fVar1 * fVar4 - fVar1 * az * fVar2)
             gy: np.float32 = gy + (fVar1 * az * fVar3 - fVar4 * ax * fVar1)
             gz: np.float32 = gz + (fVar2 * ax * fVar1 - fVar3 * ay * fVar1)
@@ -298,17 +316,17 @@ class SpellTracker:
         fVar4: np.float32 = gy * fVar1
         fVar1: np.float32 = fVar1 * gz
 
-        fVar3 = ((-(fVar6 * self._state.ahrs_quat_q1) - fVar4 * self._state.ahrs_quat_q2) - fVar1 * self._state.ahrs_quat_q3) + self._state.ahrs_quat_q0
-        fVar2 = ((fVar1 * self._state.ahrs_quat_q2 + self._state.ahrs_quat_q0 * fVar6) - fVar4 * self._state.ahrs_quat_q3) + self._state.ahrs_quat_q1
-        fVar5 = fVar6 * self._state.ahrs_quat_q3 + (fVar4 * self._state.ahrs_quat_q0 - fVar1 * self._state.ahrs_quat_q1) + self._state.ahrs_quat_q2
-        fVar4 = ((fVar4 * self._state.ahrs_quat_q1 + fVar1 * self._state.ahrs_quat_q0) - fVar6 * self._state.ahrs_quat_q2) + self._state.ahrs_quat_q3
+        fVar3 = ((-(fVar6 * q1) - fVar4 * q2) - fVar1 * q3) + q0
+        fVar2 = ((fVar1 * q2 + q0 * fVar6) - fVar4 * q3) + q1
+        fVar5 = fVar6 * q3 + (fVar4 * q0 - fVar1 * q1) + q2
+        fVar4 = ((fVar4 * q1 + fVar1 * q0) - fVar6 * q2) + q3
         fVar6 = fVar4 * fVar4 + fVar5 * fVar5 + fVar2 * fVar2 + fVar3 * fVar3
         fVar1 = self._inv_sqrt(fVar6)
 
-        self._state.ahrs_quat_q0 = fVar3 * fVar1
-        self._state.ahrs_quat_q1 = fVar2 * fVar1
-        self._state.ahrs_quat_q2 = fVar5 * fVar1
-        self._state.ahrs_quat_q3 = fVar1 * fVar4
+        state.ahrs_quat_q0 = fVar3 * fVar1
+        state.ahrs_quat_q1 = fVar2 * fVar1
+        state.ahrs_quat_q2 = fVar5 * fVar1
+        state.ahrs_quat_q3 = fVar1 * fVar4
 
     async def _recognize_spell(
         self,
@@ -333,22 +351,14 @@ class SpellTracker:
         position_count: int = self._state.position_count
 
         # Phase 1: Calculate bounding box (min/max X and Y)
-        min_x: np.float32 = np.float32(np.inf)
-        max_x: np.float32 = np.float32(-np.inf)
-        min_y: np.float32 = np.float32(np.inf)
-        max_y: np.float32 = np.float32(-np.inf)
-
-        for i in range(position_count):
-            x: np.float32 = positions[i, 0]
-            y: np.float32 = positions[i, 1]
-            if x < min_x:
-                min_x: np.float32 = x
-            if x > max_x:
-                max_x: np.float32 = x
-            if y < min_y:
-                min_y: np.float32 = y
-            if y > max_y:
-                max_y: np.float32 = y
+        if position_count == 0:
+            return -1  # No movement detected
+
+        # Column reductions over the filled slice (a view) replace a per-sample Python loop;
+        # fmin/fmax skip NaN samples and the infinite initials cover an all-NaN column, as the loop did
+        trace: np.ndarray = positions[:position_count]
+        min_x, min_y = np.fmin.reduce(trace, axis=0, initial=np.inf)
+        max_x, max_y = np.fmax.reduce(trace, axis=0, initial=-np.inf)
 
         # Compute bounding box size (larger of width or height)
         width: np.float32 = max_x - min_x
@@ -365,40 +375,23 @@ class SpellTracker:
         # Phase 3: Trim stationary tail (end of gesture)
         threshold_sq = SpellTracker._CONST_MILLIMETERMOVETHRESHOLD * SpellTracker._CONST_MILLIMETERMOVETHRESHOLD
         end_index = position_count
-        
+
         if threshold_sq > SpellTracker._CONST_0_0:
-            while end_index >= 121:  # 0x79 = 121
-                # Compare points 40 apart from the end
-                curr_idx = end_index - 1
-                prev_idx = curr_idx - 40
-                
-                dx = positions[curr_idx, 0] - positions[prev_idx, 0]
-                dy = positions[curr_idx, 1] - positions[prev_idx, 1]
-                dist_sq = dx * dx + dy * dy
-                
-                if dist_sq >= threshold_sq:
-                    break
-                    
-                end_index -= 10
-        
+            # Candidate ends step back by 10 while >= 121 (0x79); each compares points 40 apart from the end
+            ends = np.arange(position_count, 120, -10)
+            if ends.size:
+                moved = SpellTracker._moved_sq(positions, ends - 1, ends - 41) >= threshold_sq
+                end_index = int(ends[moved.argmax()]) if moved.any() else position_count - 10 * ends.size
+
         # Phase 4: Trim stationary head (start of gesture)
         start_index = 0
-        
+
         if threshold_sq > SpellTracker._CONST_0_0 and end_index > 120:
-            while start_index < end_index - 120:  # Keep at least 120 points
-                # Compare points 10 apart from the start
-                curr_idx = start_index
-                next_idx = curr_idx + 10
-                
-                dx = positions[next_idx, 0] - positions[curr_idx, 0]
-                dy = positions[next_idx, 1] - positions[curr_idx, 1]
-                dist_sq = dx * dx + dy * dy
-                
-                if dist_sq >= threshold_sq:
-                    break
-                    
-                start_index += 10
-        
+            # Candidate starts step forward by 10, keeping at least 120 points; each compares points 10 apart
+            starts = np.arange(0, end_index - 120, 10)
+            moved = SpellTracker._moved_sq(positions, starts + 10, starts) >= threshold_sq
+            start_index = int(starts[moved.argmax()]) if moved.any() else 10 * starts.size
+
         # Adjust indices for resampling
         start_float = np.float32(start_index + 1)
         trimmed_count = end_index - start_index
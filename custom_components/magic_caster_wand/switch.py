@@ -13,7 +13,6 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
 
 from .const import DOMAIN, MANUFACTURER, SIGNAL_SPELL_MODE_CHANGED
-from .mcw_ble import BLEData
 
 _LOGGER = logging.getLogger(__name__)
 